@@ -4,16 +4,19 @@ import pydeck as pdk
 import json
 import os
 
+from app_data.utils.result_cache import get_result_cache, snapshot_version
+
 # Page configuration
 st.set_page_config(
     page_title="Pool CRM - Overview",
     layout="wide"
 )
 
-# Data loading with caching
-@st.cache_data
-def load_data():
-    """Load all data files"""
+# Data loading with caching, keyed by snapshot version so a refresh
+# replaces the old copy instead of accumulating next to it
+@st.cache_data(max_entries=2)
+def load_data(version):
+    """Load all data files for the given snapshot version"""
     base_path = os.path.join(os.path.dirname(__file__), 'app_data')
     
     # Load summary
@@ -30,7 +33,8 @@ def load_data():
     return summary, address_df, matched_current, matched_removed, deduped_current, deduped_removed
 
 # Load data
-summary, address_df, matched_current, matched_removed, deduped_current, deduped_removed = load_data()
+snapshot = snapshot_version()
+summary, address_df, matched_current, matched_removed, deduped_current, deduped_removed = load_data(snapshot)
 
 # Title and header
 st.title("Pool CRM - Overview")
@@ -111,7 +115,8 @@ def prepare_map_data():
     
     return combined
 
-map_data = prepare_map_data()
+# Map layer is identical for every session, build it once per snapshot
+map_data = get_result_cache().get_or_compute(("map_layer", snapshot), prepare_map_data)
 
 # Create bounding box polygon
 bbox = summary.get('bbox', {
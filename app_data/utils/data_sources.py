@@ -0,0 +1,334 @@
+"""
+Pluggable data sources for the listings ETL (get_listings_data.py).
+
+All sources answer the same three queries over the `listing`,
+`listing_removal`, `addresses` and `pool` tables:
+- PostgresSource: the live Neon listings database and the local distilled
+  pool database
+- SQLiteSource: a single-file local stand-in mirroring those tables
+- FixtureSource: records query results of another source to disk, or
+  replays previously recorded results with no database at all
+
+Nothing connects at import time; drivers are only imported when a
+PostgresSource is actually used.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+SOURCE_TYPES = ['postgres', 'sqlite', 'record', 'replay']
+
+# Columns of the listing table used by the ETL
+LISTING_COLUMNS = [
+    'mls_id', 'date_collected', 'description', 'bedrooms', 'bathrooms',
+    'size_sqft', 'stories', 'house_cat', 'price', 'address_number',
+    'street_name', 'full_street_name', 'locality', 'municipality',
+    'province_state', 'postal_code', 'pool_mentioned', 'lat', 'lon',
+]
+REMOVAL_COLUMNS = ['removal_id', 'mls_id', 'removal_date']
+POOL_COLUMNS = ['pool_id', 'pool_type', 'cover_type', 'discovery_date']
+DATE_COLUMNS = ['date_collected', 'removal_date', 'discovery_date']
+
+# SQLite has no boolean type, columns declared with this type are read back as bools
+SQLITE_BOOL_TYPE = "BOOLEAN"
+sqlite3.register_converter(SQLITE_BOOL_TYPE, lambda value: value == b"1")
+
+CURRENT_LISTINGS_SQL = f"""
+    SELECT {', '.join(LISTING_COLUMNS)}
+    FROM listing
+    WHERE lat BETWEEN {{p}} AND {{p}}
+      AND lon BETWEEN {{p}} AND {{p}}
+    ORDER BY date_collected DESC;
+"""
+
+REMOVED_LISTINGS_SQL = f"""
+    SELECT {', '.join('l.' + c for c in LISTING_COLUMNS)},
+        r.removal_id,
+        r.removal_date
+    FROM listing_removal r
+    JOIN listing l ON l.mls_id = r.mls_id
+    WHERE r.removal_date >= {{p}}
+      AND l.lat BETWEEN {{p}} AND {{p}}
+      AND l.lon BETWEEN {{p}} AND {{p}}
+    ORDER BY r.removal_date DESC;
+"""
+
+POOL_ADDRESSES_SQL = """
+    SELECT a.*, p.pool_type, p.cover_type, p.discovery_date
+    FROM addresses a
+    LEFT JOIN pool p ON a.pool_id = p.pool_id
+    WHERE a.lat BETWEEN {p} AND {p}
+    AND a.lon BETWEEN {p} AND {p}
+"""
+
+
+def removal_cutoff(days_back):
+    """Earliest removal date included when looking back days_back days"""
+    return datetime.now() - timedelta(days=days_back)
+
+
+class PostgresSource:
+    """Live listings database plus the local distilled pool database"""
+
+    def __init__(self, listings_url=None, addresses_url=None):
+        self.listings_url = listings_url or os.getenv("DATABASE_URL")
+        self.addresses_url = addresses_url or os.getenv("DISTILLED_URL")
+        missing = [
+            name for name, url in (("DATABASE_URL", self.listings_url), ("DISTILLED_URL", self.addresses_url))
+            if not url
+        ]
+        if missing:
+            raise RuntimeError(
+                f"{' and '.join(missing)} not set, add to app_data/utils/.env "
+                "or use an offline source (--source sqlite or replay)"
+            )
+
+    def _read_listings(self, sql, params):
+        import psycopg2
+
+        conn = psycopg2.connect(self.listings_url)
+        try:
+            return pd.read_sql_query(sql.format(p='%s'), conn, params=params)
+        finally:
+            conn.close()
+
+    def query_current_listings(self, min_lat, max_lat, min_lon, max_lon):
+        return self._read_listings(CURRENT_LISTINGS_SQL, (min_lat, max_lat, min_lon, max_lon))
+
+    def query_removed_listings(self, min_lat, max_lat, min_lon, max_lon, days_back=365):
+        return self._read_listings(
+            REMOVED_LISTINGS_SQL,
+            (removal_cutoff(days_back), min_lat, max_lat, min_lon, max_lon)
+        )
+
+    def query_pool_addresses(self, min_lat, max_lat, min_lon, max_lon):
+        from sqlalchemy import create_engine
+
+        engine = create_engine(self.addresses_url)
+        try:
+            with engine.connect() as conn:
+                return pd.read_sql_query(
+                    POOL_ADDRESSES_SQL.format(p='%s'),
+                    conn,
+                    params=(min_lat, max_lat, min_lon, max_lon)
+                )
+        finally:
+            engine.dispose()
+
+
+class SQLiteSource:
+    """Local single-file stand-in mirroring the listing, listing_removal, addresses and pool tables"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _read(self, sql, params, parse_dates=None):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"SQLite stand-in not found at {self.path}, seed it first")
+        conn = sqlite3.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES)
+        try:
+            return pd.read_sql_query(sql.format(p='?'), conn, params=params, parse_dates=parse_dates)
+        finally:
+            conn.close()
+
+    def query_current_listings(self, min_lat, max_lat, min_lon, max_lon):
+        return self._read(
+            CURRENT_LISTINGS_SQL,
+            (min_lat, max_lat, min_lon, max_lon),
+            parse_dates=['date_collected']
+        )
+
+    def query_removed_listings(self, min_lat, max_lat, min_lon, max_lon, days_back=365):
+        cutoff = _to_sqlite_timestamp(pd.Series([removal_cutoff(days_back)]))[0]
+        return self._read(
+            REMOVED_LISTINGS_SQL,
+            (cutoff, min_lat, max_lat, min_lon, max_lon),
+            parse_dates=['date_collected', 'removal_date']
+        )
+
+    def query_pool_addresses(self, min_lat, max_lat, min_lon, max_lon):
+        return self._read(
+            POOL_ADDRESSES_SQL,
+            (min_lat, max_lat, min_lon, max_lon),
+            parse_dates=['discovery_date']
+        )
+
+    def write_tables(self, current, removed, addresses):
+        """Replace the stand-in tables with rows rebuilt from query results"""
+        listing = pd.concat(
+            [current[LISTING_COLUMNS], removed[LISTING_COLUMNS]],
+            ignore_index=True
+        ).drop_duplicates(subset=['mls_id'])
+        pool_rows = addresses[addresses['pool_id'].notna()]
+        tables = {
+            'listing': listing,
+            'listing_removal': removed[REMOVAL_COLUMNS],
+            'addresses': addresses.drop(columns=POOL_COLUMNS[1:]),
+            'pool': pool_rows[POOL_COLUMNS].drop_duplicates(subset=['pool_id']),
+        }
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        try:
+            for name, df in tables.items():
+                df = df.copy()
+                for col in DATE_COLUMNS:
+                    if col in df.columns:
+                        df[col] = _to_sqlite_timestamp(df[col])
+                bool_types = {col: SQLITE_BOOL_TYPE for col in df.columns if _is_bool_column(df[col])}
+                df.to_sql(name, conn, if_exists='replace', index=False, dtype=bool_types)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_listing_lat_lon ON listing (lat, lon)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_removal_mls_id ON listing_removal (mls_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_addresses_lat_lon ON addresses (lat, lon)")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def _to_sqlite_timestamp(series):
+    """Format datetimes as sortable text so SQLite comparisons work, keeping UTC offsets"""
+    series = pd.to_datetime(series)
+    if series.dt.tz is None:
+        return series.dt.strftime('%Y-%m-%d %H:%M:%S.%f')
+    return series.dt.tz_convert('UTC').dt.strftime('%Y-%m-%d %H:%M:%S.%f+00:00')
+
+
+def _is_bool_column(series):
+    """True for bool columns, including object columns of bools with nulls"""
+    if pd.api.types.is_bool_dtype(series):
+        return True
+    values = series.dropna()
+    return series.dtype == object and len(values) > 0 and values.map(lambda v: isinstance(v, bool)).all()
+
+
+# Sidecar marker for object columns holding bools with nulls, which CSV can't tell from text
+OBJECT_BOOL = "object:bool"
+# pandas 3 records text columns as "str", earlier versions only know them as object
+TEXT_IS_STR = pd.Series(['text']).dtype != object
+
+
+def write_fixture(df, path, params):
+    """Write a frame as CSV plus a JSON sidecar recording the query parameters and column dtypes"""
+    columns = {
+        col: OBJECT_BOOL if df[col].dtype == object and _is_bool_column(df[col]) else str(df[col].dtype)
+        for col in df.columns
+    }
+    df.to_csv(f"{path}.csv", index=False)
+    with open(f"{path}.json", 'w') as f:
+        json.dump({'params': params, 'columns': columns}, f, indent=4, default=str)
+
+
+def read_fixture(path):
+    """Read a frame written by write_fixture, restoring the recorded dtypes"""
+    with open(f"{path}.json", 'r') as f:
+        columns = json.load(f)['columns']
+    # Everything is read as text first so nothing is guessed, then converted per column
+    df = pd.read_csv(f"{path}.csv", dtype=str)
+    for col, dtype_name in columns.items():
+        values = df[col]
+        if dtype_name == OBJECT_BOOL:
+            values = values.map({'True': True, 'False': False})
+            dtype_name = 'object'
+        elif dtype_name == 'str' and not TEXT_IS_STR:
+            dtype_name = 'object'
+        dtype = pd.api.types.pandas_dtype(dtype_name)
+        if dtype == object:
+            # Nulls in object columns come back from the database as None
+            values = values.astype(object)
+            df[col] = values.where(values.notna(), None)
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            tz_aware = getattr(dtype, 'tz', None) is not None
+            df[col] = pd.to_datetime(values, format='ISO8601', utc=tz_aware).astype(dtype)
+        elif pd.api.types.is_bool_dtype(dtype):
+            df[col] = values.map({'True': True, 'False': False}).astype(dtype)
+        elif pd.api.types.is_numeric_dtype(dtype):
+            df[col] = pd.to_numeric(values).astype(dtype)
+        else:
+            df[col] = values.astype(dtype)
+    return df[list(columns)]
+
+
+class FixtureSource:
+    """
+    Record query results of another source to a fixture directory, or
+    replay them without any database when no inner source is given.
+
+    Fixtures are CSV files with a JSON dtype sidecar so they load the same
+    under any pandas version.
+    """
+
+    def __init__(self, fixture_dir, inner=None):
+        self.fixture_dir = fixture_dir
+        self.inner = inner
+
+    def _fixture(self, name, params, fetch):
+        key = hashlib.sha1(json.dumps(params, default=str).encode()).hexdigest()[:12]
+        path = os.path.join(self.fixture_dir, f"{name}_{key}")
+
+        if self.inner is None:
+            if not os.path.exists(f"{path}.json"):
+                raise FileNotFoundError(
+                    f"No recorded fixture for {name}{tuple(params)} in {self.fixture_dir}, "
+                    "run once with --source record first"
+                )
+            return read_fixture(path)
+
+        df = fetch()
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        write_fixture(df, path, params)
+        return df
+
+    def query_current_listings(self, min_lat, max_lat, min_lon, max_lon):
+        params = [min_lat, max_lat, min_lon, max_lon]
+        return self._fixture(
+            'current_listings', params,
+            lambda: self.inner.query_current_listings(*params)
+        )
+
+    def query_removed_listings(self, min_lat, max_lat, min_lon, max_lon, days_back=365):
+        # Keyed by days_back rather than the cutoff date so replays stay stable
+        params = [min_lat, max_lat, min_lon, max_lon, days_back]
+        return self._fixture(
+            'removed_listings', params,
+            lambda: self.inner.query_removed_listings(*params)
+        )
+
+    def query_pool_addresses(self, min_lat, max_lat, min_lon, max_lon):
+        params = [min_lat, max_lat, min_lon, max_lon]
+        return self._fixture(
+            'pool_addresses', params,
+            lambda: self.inner.query_pool_addresses(*params)
+        )
+
+
+def get_data_source(source_type=None, sqlite_path=None, fixture_dir=None):
+    """
+    Build the data source selected by argument or environment.
+
+    Args:
+        source_type: One of SOURCE_TYPES, defaults to DATA_SOURCE or 'postgres'
+        sqlite_path: SQLite stand-in file, defaults to SQLITE_PATH
+        fixture_dir: Fixture directory for record/replay, defaults to FIXTURE_DIR
+
+    Returns:
+        A source exposing query_current_listings, query_removed_listings
+        and query_pool_addresses
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    source_type = source_type or os.getenv("DATA_SOURCE", "postgres")
+    sqlite_path = sqlite_path or os.getenv("SQLITE_PATH", os.path.join(here, 'local_pool_db.sqlite'))
+    fixture_dir = fixture_dir or os.getenv("FIXTURE_DIR", os.path.join(here, 'fixtures'))
+
+    if source_type == 'postgres':
+        return PostgresSource()
+    if source_type == 'sqlite':
+        return SQLiteSource(sqlite_path)
+    if source_type == 'record':
+        return FixtureSource(fixture_dir, inner=PostgresSource())
+    if source_type == 'replay':
+        return FixtureSource(fixture_dir)
+    raise ValueError(f"Unknown data source '{source_type}', expected one of {', '.join(SOURCE_TYPES)}")
@@ -0,0 +1,93 @@
+"""
+Loading and filtering of the published listings snapshot.
+
+Shared by the Streamlit listings page and the headless read API so both
+apply exactly the same filter semantics.
+"""
+import json
+import os
+
+import pandas as pd
+
+# Directory holding the published data snapshot (app_data/)
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Listing category -> CSV file written by get_listings_data.py
+LISTING_FILES = {
+    'matched_current': 'matched_current_listings.csv',
+    'matched_removed': 'matched_removed_listings.csv',
+    'deduped_current': 'deduped_current_less_matched.csv',
+    'deduped_removed': 'deduped_removed_less_matched.csv',
+}
+
+# Recently sold categories that make up the sales leads, and their match label
+LEAD_CATEGORIES = {
+    'matched_removed': 'matched',
+    'deduped_removed': 'probable',
+}
+
+INTERACTIONS_FILE = os.path.join(DATA_DIR, 'user_interactions.json')
+
+
+def read_snapshot(base_path=DATA_DIR):
+    """Read the summary and every listings CSV of the current snapshot"""
+    with open(os.path.join(base_path, 'listings_summary.json'), 'r') as f:
+        summary = json.load(f)
+    listings = {
+        category: pd.read_csv(os.path.join(base_path, filename))
+        for category, filename in LISTING_FILES.items()
+    }
+    return summary, listings
+
+
+def load_user_interactions(path=INTERACTIONS_FILE):
+    """Load user interaction data (reached_out flags)"""
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return {}
+
+
+def build_leads(listings, interactions):
+    """Combine recently sold listings into one leads frame with outreach status"""
+    frames = []
+    for category, match in LEAD_CATEGORIES.items():
+        df = listings[category].copy()
+        df['match'] = match
+        frames.append(df)
+    leads = pd.concat(frames, ignore_index=True)
+
+    if 'recommended_reachout_date' not in leads.columns and 'removal_date' in leads.columns:
+        leads['recommended_reachout_date'] = (
+            pd.to_datetime(leads['removal_date'], errors='coerce') + pd.Timedelta(days=60)
+        )
+    leads['reached_out'] = leads['mls_id'].apply(
+        lambda x: interactions.get(str(x), {}).get('reached_out', False)
+    )
+    leads['date_reached'] = leads['mls_id'].apply(
+        lambda x: interactions.get(str(x), {}).get('date_reached', None)
+    )
+    return leads
+
+
+def apply_filters(df, price_range=None, selected_beds=None, selected_munis=None, date_range=None):
+    """Return the rows of df matching the selected filter values"""
+    filtered_df = df
+    if 'price' in df.columns and price_range is not None:
+        filtered_df = filtered_df[
+            (filtered_df['price'] >= price_range[0]) &
+            (filtered_df['price'] <= price_range[1])
+        ]
+    if 'bedrooms' in df.columns and selected_beds:
+        filtered_df = filtered_df[filtered_df['bedrooms'].isin(selected_beds)]
+    if 'municipality' in df.columns and selected_munis:
+        filtered_df = filtered_df[filtered_df['municipality'].isin(selected_munis)]
+    if 'removal_date' in df.columns and date_range is not None:
+        if len(date_range) == 2:
+            start_date, end_date = date_range
+            filtered_df_dates = pd.to_datetime(filtered_df['removal_date'], errors='coerce')
+            filtered_df = filtered_df[
+                (filtered_df_dates.dt.date >= start_date) &
+                (filtered_df_dates.dt.date <= end_date)
+            ]
+    return filtered_df
@@ -0,0 +1,146 @@
+"""
+Headless load harness for the Streamlit app.
+
+Simulates N concurrent sessions, each rendering the Overview and Listings
+pages several times and nudging the price filters so the result cache sees a
+realistic mix of repeated and unique selections. Reports latency percentiles
+per page along with result cache statistics.
+
+Each session runs in its own process: Streamlit's AppTest swaps process-wide
+runtime state on every run, so two AppTests in one process can't run at once.
+A session keeps a single AppTest for all of its iterations, so widget state
+carries over between page visits like it does for a real user. Since every
+process has its own result cache, the reported hits only count reuse within a
+session; the served app shares one cache across all sessions.
+
+Usage:
+    python app_data/utils/load_harness.py --sessions 20 --iterations 5
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Streamlit puts the app directory on sys.path when serving, do the same here
+sys.path.insert(0, APP_ROOT)
+
+from app_data.utils.result_cache import get_result_cache
+
+MAIN_SCRIPT = os.path.join(APP_ROOT, 'app.py')
+# Page name -> path relative to the main script, as AppTest.switch_page expects
+PAGES = {
+    'overview': 'app.py',
+    'listings': os.path.join('pages', 'listings.py'),
+}
+
+# Number of distinct filter selections spread across sessions
+FILTER_VARIANTS = 4
+
+# Cache counters summed across session processes
+CACHE_COUNTERS = ['hits', 'coalesced', 'misses', 'evictions']
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def narrow_price_filters(at, variant):
+    """Tighten every price slider on the page by an amount depending on variant"""
+    for slider in at.slider:
+        if not str(slider.key).startswith('price_'):
+            continue
+        low, high = slider.min, slider.max
+        trim = (high - low) * variant / (FILTER_VARIANTS * 4)
+        slider.set_value((low + trim, high - trim))
+
+
+def _timed_run(at, results, page):
+    start = time.perf_counter()
+    at.run()
+    results.append((page, time.perf_counter() - start, bool(at.exception)))
+    return not at.exception
+
+
+def run_session(session_id, iterations, timeout):
+    """
+    Drive both pages for one simulated user in the current process.
+
+    Returns the (page, seconds, error) timings and this process's result
+    cache statistics.
+    """
+    # Imported here so the rest of the module can be used without Streamlit
+    from streamlit.testing.v1 import AppTest
+
+    # Worker processes may be reused, start every session from a cold cache
+    get_result_cache().clear()
+    at = AppTest.from_file(MAIN_SCRIPT, default_timeout=timeout)
+    results = []
+    for iteration in range(iterations):
+        for page, script in PAGES.items():
+            at.switch_page(script)
+            if _timed_run(at, results, page) and page == 'listings':
+                narrow_price_filters(at, (session_id + iteration) % FILTER_VARIANTS)
+                _timed_run(at, results, 'listings_filtered')
+    return results, get_result_cache().stats()
+
+
+def combine_cache_stats(all_stats):
+    """Sum per-session cache counters and report the largest session footprint"""
+    combined = {name: sum(stats[name] for stats in all_stats) for name in CACHE_COUNTERS}
+    lookups = combined['hits'] + combined['coalesced'] + combined['misses']
+    combined['hit_rate'] = (combined['hits'] + combined['coalesced']) / lookups if lookups > 0 else 0.0
+    combined['bytes'] = max((stats['bytes'] for stats in all_stats), default=0)
+    combined['max_bytes'] = max((stats['max_bytes'] for stats in all_stats), default=0)
+    return combined
+
+
+def run_load(sessions, iterations, timeout):
+    """Run sessions concurrently, one process each, returning (results, combined cache stats)"""
+    with ProcessPoolExecutor(max_workers=sessions) as pool:
+        futures = [
+            pool.submit(run_session, session_id, iterations, timeout)
+            for session_id in range(sessions)
+        ]
+        outcomes = [future.result() for future in futures]
+    results = [r for session_results, _ in outcomes for r in session_results]
+    return results, combine_cache_stats([stats for _, stats in outcomes])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent sessions against the Pool CRM app")
+    parser.add_argument('--sessions', type=int, default=10, help="Number of concurrent sessions")
+    parser.add_argument('--iterations', type=int, default=3, help="Page visits per session")
+    parser.add_argument('--timeout', type=float, default=60, help="Per-run timeout in seconds")
+    args = parser.parse_args()
+
+    wall_start = time.perf_counter()
+    results, stats = run_load(args.sessions, args.iterations, args.timeout)
+    wall_time = time.perf_counter() - wall_start
+
+    print(f"{args.sessions} sessions x {args.iterations} iterations in {wall_time:.2f}s")
+    print(f"{'page':<20}{'runs':>6}{'errors':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for page in sorted({r[0] for r in results}):
+        timings = [r[1] * 1000 for r in results if r[0] == page]
+        errors = sum(1 for r in results if r[0] == page and r[2])
+        print(
+            f"{page:<20}{len(timings):>6}{errors:>8}"
+            f"{percentile(timings, 50):>10.1f}{percentile(timings, 90):>10.1f}"
+            f"{percentile(timings, 99):>10.1f}{max(timings):>10.1f}"
+        )
+
+    print(
+        f"\nResult cache (per session): {stats['hits']} hits, {stats['coalesced']} coalesced, "
+        f"{stats['misses']} misses ({stats['hit_rate'] * 100:.1f}% hit rate), {stats['evictions']} evictions, "
+        f"peak {stats['bytes'] / 1024 / 1024:.1f} / {stats['max_bytes'] / 1024 / 1024:.0f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
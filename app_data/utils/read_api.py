@@ -0,0 +1,449 @@
+"""
+Headless read-only HTTP API over the published listings snapshot.
+
+Lets bulk consumers (mailing, dialer) pull listings and leads without
+driving the Streamlit UI. Serves the same files the app reads, with
+filtering, paging and column projection. Responses are streamed in chunks
+and carry an ETag derived from the snapshot version, so unchanged data can
+be revalidated with If-None-Match for a 304.
+
+Usage:
+    python app_data/utils/read_api.py --port 8502
+
+Endpoints:
+    GET /snapshot                 Snapshot version and summary statistics
+    GET /listings/<category>      matched_current, matched_removed,
+                                  deduped_current or deduped_removed
+    GET /leads                    Recently sold listings (matched + probable)
+                                  with outreach status
+
+Query parameters (listings and leads):
+    price_min, price_max          Price range
+    bedrooms                      Comma separated bedroom counts
+    municipality                  Comma separated municipalities
+    sold_from, sold_to            Sold date range (YYYY-MM-DD), *_removed and leads only
+    fields                        Comma separated columns to return
+    offset, limit                 Paging (limit defaults to 1000, max 10000)
+    format                        json (default) or csv
+
+Filters on a column the data doesn't have are rejected with a 400.
+
+Leads only:
+    match                         matched or probable
+    reached_out                   true or false
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import traceback
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, APP_ROOT)
+
+from app_data.utils.listings_query import (
+    INTERACTIONS_FILE,
+    LISTING_FILES,
+    apply_filters,
+    build_leads,
+    load_user_interactions,
+    read_snapshot,
+)
+from app_data.utils.result_cache import get_result_cache, snapshot_version
+
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10000
+# Rows serialized per streamed chunk
+CHUNK_ROWS = 500
+# Attempts at reading a consistent snapshot while a refresh is rewriting it
+SNAPSHOT_READ_ATTEMPTS = 3
+SNAPSHOT_RETRY_SECONDS = 0.5
+
+
+class QueryError(ValueError):
+    """Invalid request parameters, reported to the client as 400"""
+
+
+class SnapshotUnavailable(RuntimeError):
+    """No consistent snapshot or interactions file could be read, reported to the client as 503"""
+
+
+class _SnapshotChanged(Exception):
+    """Files changed while being read, the result must not be cached"""
+
+
+def interactions_version():
+    """Return a version string for user_interactions.json, which leads depend on"""
+    try:
+        stat = os.stat(INTERACTIONS_FILE)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+    except FileNotFoundError:
+        return "missing"
+
+
+def _read_consistent(name, current_version, read, unavailable_message):
+    """
+    Return (version, value) for files that may be rewritten while being read.
+
+    Each version is read once and cached. A read that overlaps a rewrite
+    (the version changing underneath it, or a half-written file) is retried
+    and never cached, so a value is only ever served under its own version.
+    """
+    for attempt in range(SNAPSHOT_READ_ATTEMPTS):
+        version = current_version()
+
+        def compute():
+            try:
+                value = read()
+            except (OSError, ValueError) as e:
+                raise _SnapshotChanged(str(e))
+            if current_version() != version:
+                raise _SnapshotChanged(f"{name} changed while reading")
+            return value
+
+        try:
+            return version, get_result_cache().get_or_compute((name, version), compute)
+        except _SnapshotChanged:
+            if attempt + 1 < SNAPSHOT_READ_ATTEMPTS:
+                time.sleep(SNAPSHOT_RETRY_SECONDS)
+    raise SnapshotUnavailable(unavailable_message)
+
+
+def get_snapshot():
+    """
+    Return (version, summary, listings) for the current snapshot.
+
+    get_listings_data.py rewrites the files one at a time, so reads that
+    overlap a refresh are retried rather than cached.
+    """
+    version, (summary, listings) = _read_consistent(
+        "api_snapshot", snapshot_version, read_snapshot,
+        "Snapshot is being refreshed or incomplete, retry shortly"
+    )
+    return version, summary, listings
+
+
+def get_interactions():
+    """Return (version, interactions) for user_interactions.json, read consistently like the snapshot"""
+    return _read_consistent(
+        "api_interactions", interactions_version, load_user_interactions,
+        "User interactions are being saved, retry shortly"
+    )
+
+
+def get_leads(version, listings, interactions_key, interactions):
+    """Return the leads frame for a snapshot and interactions version"""
+    return get_result_cache().get_or_compute(
+        ("api_leads", version, interactions_key),
+        lambda: build_leads(listings, interactions)
+    )
+
+
+def _single(params, name):
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def _split(params, name):
+    value = _single(params, name)
+    if value is None:
+        return None
+    return tuple(v.strip() for v in value.split(',') if v.strip())
+
+
+def _parse_float(params, name):
+    value = _single(params, name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise QueryError(f"{name} must be a number")
+
+
+def _parse_date(params, name):
+    value = _single(params, name)
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise QueryError(f"{name} must be a date (YYYY-MM-DD)")
+
+
+def _parse_int(params, name, default, minimum, maximum):
+    value = _single(params, name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise QueryError(f"{name} must be an integer")
+    if number < minimum or number > maximum:
+        raise QueryError(f"{name} must be between {minimum} and {maximum}")
+    return number
+
+
+def parse_filters(params):
+    """Turn query parameters into a hashable tuple of apply_filters arguments"""
+    price_min = _parse_float(params, 'price_min')
+    price_max = _parse_float(params, 'price_max')
+    price_range = None
+    if price_min is not None or price_max is not None:
+        price_range = (
+            price_min if price_min is not None else float('-inf'),
+            price_max if price_max is not None else float('inf'),
+        )
+
+    bedrooms = _split(params, 'bedrooms')
+    if bedrooms is not None:
+        try:
+            bedrooms = tuple(float(b) for b in bedrooms)
+        except ValueError:
+            raise QueryError("bedrooms must be a comma separated list of numbers")
+
+    sold_from = _parse_date(params, 'sold_from')
+    sold_to = _parse_date(params, 'sold_to')
+    date_range = None
+    if sold_from is not None or sold_to is not None:
+        date_range = (sold_from or date.min, sold_to or date.max)
+
+    return price_range, bedrooms, _split(params, 'municipality'), date_range
+
+
+# Column each filter applies to, and the query parameters that set it
+FILTER_COLUMNS = [
+    ('price', ('price_min', 'price_max')),
+    ('bedrooms', ('bedrooms',)),
+    ('municipality', ('municipality',)),
+    ('removal_date', ('sold_from', 'sold_to')),
+]
+
+
+def check_filter_columns(params, columns):
+    """Reject filters on columns the data doesn't have rather than silently ignoring them"""
+    for column, names in FILTER_COLUMNS:
+        used = [name for name in names if name in params]
+        if used and column not in columns:
+            raise QueryError(f"{', '.join(used)} not supported here, the data has no {column} column")
+
+
+def filter_leads(leads, params):
+    """Apply the lead-only match and reached_out filters"""
+    match = _single(params, 'match')
+    if match is not None:
+        if match not in ('matched', 'probable'):
+            raise QueryError("match must be 'matched' or 'probable'")
+        leads = leads[leads['match'] == match]
+
+    reached_out = _single(params, 'reached_out')
+    if reached_out is not None:
+        if reached_out.lower() not in ('true', 'false'):
+            raise QueryError("reached_out must be 'true' or 'false'")
+        leads = leads[leads['reached_out'] == (reached_out.lower() == 'true')]
+    return leads
+
+
+def make_etag(*parts):
+    """Build a strong ETag from the data versions and normalized query"""
+    digest = hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode())
+    return f'"{digest.hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against our ETag (RFC 9110)"""
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class ReadAPIHandler(BaseHTTPRequestHandler):
+    """Serves GET requests over the current snapshot"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "PoolCRMReadAPI/1.0"
+
+    def send_response(self, code, message=None):
+        self._response_started = True
+        super().send_response(code, message)
+
+    def do_GET(self):
+        self._response_started = False
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        parts = [p for p in url.path.split('/') if p]
+
+        try:
+            if parts == ['snapshot']:
+                self._send_snapshot(*get_snapshot())
+            elif len(parts) == 2 and parts[0] == 'listings':
+                if parts[1] not in LISTING_FILES:
+                    self._send_error(404, f"Unknown listing category '{parts[1]}'")
+                    return
+                version, _, listings = get_snapshot()
+                self._send_listings(version, listings, parts[1], params)
+            elif parts == ['leads']:
+                version, _, listings = get_snapshot()
+                self._send_leads(version, listings, params)
+            else:
+                self._send_error(404, f"Unknown path '{url.path}'")
+        except QueryError as e:
+            self._send_error(400, str(e))
+        except SnapshotUnavailable as e:
+            self._send_error(503, str(e), headers={'Retry-After': '5'})
+        except ConnectionError:
+            # Client went away mid-response, nothing left to tell it
+            self.close_connection = True
+        except Exception as e:
+            self.log_error("Error serving %s: %r", self.path, e)
+            traceback.print_exc()
+            if self._response_started:
+                # Too late for a status code, drop the connection so the
+                # client sees a truncated body rather than a complete one
+                self.close_connection = True
+            else:
+                self._send_error(500, "Internal server error")
+
+    def _send_snapshot(self, version, summary, listings):
+        etag = make_etag(version)
+        if self._not_modified(etag, version):
+            return
+        body = json.dumps({
+            'snapshot_version': version,
+            'summary': summary,
+            'counts': {category: len(df) for category, df in listings.items()},
+        }, default=str).encode()
+        self.send_response(200)
+        self._send_common_headers(etag, version)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_listings(self, version, listings, category, params):
+        filters = parse_filters(params)
+        check_filter_columns(params, listings[category].columns)
+        etag = make_etag(version, category, sorted(params.items()))
+        if self._not_modified(etag, version):
+            return
+
+        df = get_result_cache().get_or_compute(
+            ("api_filter", version, category, filters),
+            lambda: apply_filters(listings[category], *filters)
+        )
+        self._stream_frame(df, params, etag, version)
+
+    def _send_leads(self, version, listings, params):
+        filters = parse_filters(params)
+        interactions_key, interactions = get_interactions()
+        etag = make_etag(version, interactions_key, 'leads', sorted(params.items()))
+        if self._not_modified(etag, version):
+            return
+
+        leads = get_leads(version, listings, interactions_key, interactions)
+        check_filter_columns(params, leads.columns)
+        df = filter_leads(apply_filters(leads, *filters), params)
+        self._stream_frame(df, params, etag, version)
+
+    def _stream_frame(self, df, params, etag, version):
+        """Project, page and stream a frame as chunked JSON or CSV"""
+        fields = _split(params, 'fields')
+        if fields:
+            unknown = [f for f in fields if f not in df.columns]
+            if unknown:
+                raise QueryError(f"Unknown fields: {', '.join(unknown)}")
+        offset = _parse_int(params, 'offset', 0, 0, sys.maxsize)
+        limit = _parse_int(params, 'limit', DEFAULT_LIMIT, 1, MAX_LIMIT)
+        output_format = _single(params, 'format') or 'json'
+        if output_format not in ('json', 'csv'):
+            raise QueryError("format must be 'json' or 'csv'")
+
+        total = len(df)
+        page = df.iloc[offset:offset + limit]
+        if fields:
+            page = page[list(fields)]
+
+        self.send_response(200)
+        self._send_common_headers(etag, version)
+        self.send_header('X-Total-Count', str(total))
+        self.send_header('Transfer-Encoding', 'chunked')
+        if output_format == 'csv':
+            self.send_header('Content-Type', 'text/csv')
+            self.end_headers()
+            for start in range(0, max(len(page), 1), CHUNK_ROWS):
+                chunk = page.iloc[start:start + CHUNK_ROWS]
+                self._write_chunk(chunk.to_csv(index=False, header=(start == 0)))
+        else:
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self._write_chunk(
+                f'{{"snapshot_version": "{version}", "total": {total}, '
+                f'"offset": {offset}, "limit": {limit}, "rows": ['
+            )
+            for start in range(0, len(page), CHUNK_ROWS):
+                chunk = page.iloc[start:start + CHUNK_ROWS]
+                rows = chunk.to_json(orient='records', date_format='iso')[1:-1]
+                self._write_chunk((',' if start > 0 else '') + rows)
+            self._write_chunk(']}')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _write_chunk(self, text):
+        data = text.encode()
+        if data:
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+
+    def _not_modified(self, etag, version):
+        """Answer 304 if the client already has this exact response"""
+        if not etag_matches(self.headers.get('If-None-Match', ''), etag):
+            return False
+        self.send_response(304)
+        self._send_common_headers(etag, version)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        return True
+
+    def _send_common_headers(self, etag, version):
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Snapshot-Version', version)
+
+    def _send_error(self, status, message, headers=None):
+        body = json.dumps({'error': message}).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-only HTTP API over the Pool CRM snapshot")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind")
+    parser.add_argument('--port', type=int, default=8502, help="Port to listen on")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), ReadAPIHandler)
+    print(f"Serving Pool CRM read API on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
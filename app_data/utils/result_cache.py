@@ -0,0 +1,192 @@
+"""
+Shared result cache for derived data (filter results, map layers, exports).
+
+Streamlit's `st.cache_data` only covers the raw loaders; everything derived
+from them is otherwise recomputed on every rerun of every session. This
+module keeps a single process-wide cache that all sessions share.
+
+Entries are keyed by the data snapshot version plus the parameters that
+produced them, so a weekly data refresh invalidates old results without any
+manual clearing. Memory is bounded by a byte budget with LRU eviction.
+
+Cached values are shared between sessions and must be treated as read-only.
+"""
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import pandas as pd
+
+from app_data.utils.listings_query import DATA_DIR
+
+# Files written by get_listings_data.py that make up one snapshot.
+# user_interactions.json is left out on purpose: it changes on every save
+# and does not affect any derived listing data.
+SNAPSHOT_FILES = [
+    'listings_summary.json',
+    'address_df.csv',
+    'matched_current_listings.csv',
+    'matched_removed_listings.csv',
+    'deduped_current_less_matched.csv',
+    'deduped_removed_less_matched.csv',
+]
+
+# Memory budget in megabytes, overridable through the environment
+DEFAULT_MAX_MB = 256
+
+
+def snapshot_version(base_path=DATA_DIR):
+    """Return a short version string identifying the current data snapshot"""
+    digest = hashlib.sha1()
+    for name in SNAPSHOT_FILES:
+        path = os.path.join(base_path, name)
+        try:
+            stat = os.stat(path)
+            digest.update(f"{name}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+        except FileNotFoundError:
+            digest.update(f"{name}:missing;".encode())
+    return digest.hexdigest()[:12]
+
+
+def estimate_size(value):
+    """Estimate the memory footprint of a cached value in bytes"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(value, pd.DataFrame) else int(usage)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """Thread-safe LRU cache bounded by an approximate byte budget"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._pending = {}  # key -> Future for results still being computed
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._coalesced = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key, marking it as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store a value, evicting least recently used entries to fit"""
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                # Larger than the whole budget, not worth evicting everything for
+                return value
+            while self._entries and self._bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+            self._entries[key] = (value, size)
+            self._bytes += size
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Concurrent misses on the same key are coalesced: the first caller
+        computes, later callers wait for its result instead of recomputing.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = Future()
+                self._misses += 1
+            else:
+                self._coalesced += 1
+        if not owner:
+            return pending.result()
+
+        # Computed outside the lock so slow results don't block other sessions
+        try:
+            value = self.put(key, compute())
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[key]
+        pending.set_result(value)
+        return value
+
+    def clear(self):
+        """Drop all entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._coalesced = 0
+
+    def stats(self):
+        """
+        Return hit/miss counters and current memory usage.
+
+        Coalesced lookups waited on another caller's computation; they count
+        towards the hit rate since they did not compute anything themselves.
+        """
+        with self._lock:
+            lookups = self._hits + self._coalesced + self._misses
+            return {
+                'hits': self._hits,
+                'coalesced': self._coalesced,
+                'misses': self._misses,
+                'hit_rate': (self._hits + self._coalesced) / lookups if lookups > 0 else 0.0,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Return the process-wide cache shared by all sessions"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            max_mb = float(os.getenv("RESULT_CACHE_MAX_MB", DEFAULT_MAX_MB))
+            _cache = ResultCache(int(max_mb * 1024 * 1024))
+        return _cache
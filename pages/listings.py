@@ -4,6 +4,9 @@ import json
 import os
 from datetime import datetime
 
+from app_data.utils.listings_query import apply_filters
+from app_data.utils.result_cache import get_result_cache, snapshot_version
+
 # Page configuration
 st.set_page_config(
     page_title="Pool CRM - Listings",
@@ -11,9 +14,9 @@ st.set_page_config(
 )
 
 # Helper functions
-@st.cache_data
-def load_listings_data():
-    """Load all listings CSV files"""
+@st.cache_data(max_entries=2)
+def load_listings_data(version):
+    """Load all listings CSV files for the given snapshot version"""
     base_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app_data')
     
     matched_current = pd.read_csv(os.path.join(base_path, 'matched_current_listings.csv'))
@@ -24,7 +27,6 @@ def load_listings_data():
     return matched_current, matched_removed, deduped_current, deduped_removed
 
 
-
 def display_listings_table(df, title, tab_key=""):
     """Display a listings table with filtering options"""
     st.subheader(title)
@@ -34,6 +36,8 @@ def display_listings_table(df, title, tab_key=""):
         st.info("No listings in this category.")
         return
     
+    price_range = selected_beds = selected_munis = date_range = None
+
     # Add filters
     with st.expander("Filters", expanded=False):
         filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
@@ -87,25 +91,20 @@ def display_listings_table(df, title, tab_key=""):
                 else:
                     date_range = None
     
-    # Apply filters
-    filtered_df = df.copy()
-    if 'price' in df.columns:
-        filtered_df = filtered_df[
-            (filtered_df['price'] >= price_range[0]) & 
-            (filtered_df['price'] <= price_range[1])
-        ]
-    if 'bedrooms' in df.columns and selected_beds:
-        filtered_df = filtered_df[filtered_df['bedrooms'].isin(selected_beds)]
-    if 'municipality' in df.columns and selected_munis:
-        filtered_df = filtered_df[filtered_df['municipality'].isin(selected_munis)]
-    if 'removal_date' in df.columns and date_range is not None:
-        if len(date_range) == 2:
-            start_date, end_date = date_range
-            filtered_df_dates = pd.to_datetime(filtered_df['removal_date'], errors='coerce')
-            filtered_df = filtered_df[
-                (filtered_df_dates.dt.date >= start_date) & 
-                (filtered_df_dates.dt.date <= end_date)
-            ]
+    # Apply filters, sharing results across sessions with the same selection
+    cache = get_result_cache()
+    filter_key = (
+        tab_key,
+        snapshot,
+        tuple(price_range) if price_range is not None else None,
+        tuple(selected_beds) if selected_beds is not None else None,
+        tuple(selected_munis) if selected_munis is not None else None,
+        tuple(date_range) if date_range is not None else None,
+    )
+    filtered_df = cache.get_or_compute(
+        ("filter",) + filter_key,
+        lambda: apply_filters(df, price_range, selected_beds, selected_munis, date_range)
+    )
     
     st.caption(f"Filtered: {len(filtered_df)} listings")
     
@@ -166,7 +165,10 @@ def display_listings_table(df, title, tab_key=""):
     )
     
     # Download button
-    csv = filtered_df.to_csv(index=False)
+    csv = cache.get_or_compute(
+        ("export",) + filter_key,
+        lambda: filtered_df.to_csv(index=False)
+    )
     st.download_button(
         label=f"Download {title} (CSV)",
         data=csv,
@@ -181,7 +183,8 @@ st.title("Pool Listings Management")
 st.markdown("---")
 
 # Load data
-matched_current, matched_removed, deduped_current, deduped_removed = load_listings_data()
+snapshot = snapshot_version()
+matched_current, matched_removed, deduped_current, deduped_removed = load_listings_data(snapshot)
 
 # Create tabs
 tab1, tab2, tab3, tab4 = st.tabs([
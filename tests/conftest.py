@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app is run from the repository root (streamlit run app.py), mirror that for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
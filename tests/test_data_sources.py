@@ -0,0 +1,122 @@
+import os
+
+import pandas as pd
+import pytest
+
+from app_data.utils import get_listings_data
+from app_data.utils.data_sources import (
+    FixtureSource,
+    PostgresSource,
+    SQLiteSource,
+    get_data_source,
+    read_fixture,
+    write_fixture,
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'etl')
+# Bounding box the synthetic fixture set was recorded for
+BBOX = {'lat_min': 43.8, 'lat_max': 43.9, 'lon_min': -79.6, 'lon_max': -79.5}
+BBOX_ARGS = (BBOX['lat_min'], BBOX['lat_max'], BBOX['lon_min'], BBOX['lon_max'])
+
+
+def replayed_frames():
+    source = FixtureSource(FIXTURE_DIR)
+    return (
+        source.query_current_listings(*BBOX_ARGS),
+        source.query_removed_listings(*BBOX_ARGS, days_back=365),
+        source.query_pool_addresses(*BBOX_ARGS),
+    )
+
+
+def test_fixture_round_trip_keeps_dtypes(tmp_path):
+    df = pd.DataFrame({
+        'mls_id': [1, 2],
+        'price': [1.5, None],
+        'postal_code': ['01234', None],
+        'has_pool': [True, False],
+        'pool_mentioned': pd.Series([True, None], dtype=object),
+        'pool_id': pd.array([7, None], dtype='Int64'),
+        'removal_date': pd.to_datetime(['2026-01-01 01:02:03.5+00:00', '2026-02-01 00:00:00+00:00'], format='ISO8601'),
+        'date_collected': pd.to_datetime(['2026-01-01', None]),
+    })
+    path = str(tmp_path / 'frame')
+    write_fixture(df, path, [1, 2])
+
+    pd.testing.assert_frame_equal(read_fixture(path), df)
+
+
+def test_record_then_replay(tmp_path):
+    class Inner:
+        def query_current_listings(self, *bbox):
+            return pd.DataFrame({'mls_id': [1], 'lat': [bbox[0]]})
+
+    FixtureSource(str(tmp_path), inner=Inner()).query_current_listings(*BBOX_ARGS)
+    replayed = FixtureSource(str(tmp_path)).query_current_listings(*BBOX_ARGS)
+    assert replayed.to_dict('records') == [{'mls_id': 1, 'lat': 43.8}]
+
+    with pytest.raises(FileNotFoundError):
+        FixtureSource(str(tmp_path)).query_current_listings(0, 1, 0, 1)
+
+
+def test_etl_runs_on_committed_fixtures():
+    source = FixtureSource(FIXTURE_DIR)
+    current, removed = get_listings_data.get_current_and_removed_listings(source, BBOX)
+    addresses = get_listings_data.get_pool_addresses(source, BBOX)
+
+    matched_removed = get_listings_data.cross_reference_removed_with_addresses(removed, addresses)
+    matched_current = get_listings_data.cross_reference_removed_with_addresses(current, addresses)
+    assert matched_removed['mls_id'].tolist() == [2001]
+    assert matched_current['mls_id'].tolist() == [1001]
+    assert 'recommended_reachout_date' in removed.columns
+
+
+def test_sqlite_round_trip(tmp_path):
+    current, removed, addresses = replayed_frames()
+    sqlite = SQLiteSource(str(tmp_path / 'pool.sqlite'))
+    sqlite.write_tables(current, removed, addresses)
+
+    sqlite_current = sqlite.query_current_listings(*BBOX_ARGS)
+    assert sorted(sqlite_current['mls_id']) == sorted(set(current['mls_id']) | set(removed['mls_id']))
+    assert sqlite_current['pool_mentioned'].map(type).eq(bool).all()
+    assert str(sqlite_current['date_collected'].dt.tz) == 'UTC'
+
+    sqlite_addresses = sqlite.query_pool_addresses(*BBOX_ARGS).sort_values('address_id', ignore_index=True)
+    assert sqlite_addresses['has_pool'].tolist() == addresses['has_pool'].tolist()
+    assert sqlite_addresses['pool_type'].tolist()[:3] == ['0', '0', '0']
+    expected = addresses.sort_values('address_id', ignore_index=True)['discovery_date']
+    pd.testing.assert_series_equal(
+        sqlite_addresses['discovery_date'].dt.tz_convert('UTC').astype('datetime64[us, UTC]'),
+        expected.astype('datetime64[us, UTC]'),
+    )
+
+
+def test_sqlite_removed_listings_respect_days_back(tmp_path):
+    current, removed, addresses = replayed_frames()
+    now = pd.Timestamp.now(tz='UTC')
+    removed = removed.assign(removal_date=[now - pd.Timedelta(days=10), now - pd.Timedelta(days=400), now])
+    sqlite = SQLiteSource(str(tmp_path / 'pool.sqlite'))
+    sqlite.write_tables(current, removed, addresses)
+
+    recent = sqlite.query_removed_listings(*BBOX_ARGS, days_back=365)
+    assert sorted(recent['mls_id']) == [2001, 2003]
+    assert str(recent['removal_date'].dt.tz) == 'UTC'
+
+
+def test_sqlite_source_requires_seeded_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SQLiteSource(str(tmp_path / 'missing.sqlite')).query_current_listings(*BBOX_ARGS)
+
+
+def test_postgres_source_requires_urls(monkeypatch):
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    monkeypatch.delenv('DISTILLED_URL', raising=False)
+    with pytest.raises(RuntimeError, match='DATABASE_URL and DISTILLED_URL'):
+        PostgresSource()
+
+
+def test_get_data_source(tmp_path):
+    assert isinstance(get_data_source('sqlite', sqlite_path=str(tmp_path / 'x.sqlite')), SQLiteSource)
+    replay = get_data_source('replay', fixture_dir=str(tmp_path))
+    assert isinstance(replay, FixtureSource) and replay.inner is None
+    with pytest.raises(ValueError):
+        get_data_source('mysql')
@@ -0,0 +1,37 @@
+import pytest
+
+from app_data.utils.load_harness import combine_cache_stats, percentile, run_load
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([], 50) == 0.0
+
+
+def test_combine_cache_stats_sums_counters():
+    stats = [
+        {'hits': 3, 'coalesced': 0, 'misses': 1, 'evictions': 0, 'bytes': 100, 'max_bytes': 1000},
+        {'hits': 0, 'coalesced': 1, 'misses': 3, 'evictions': 2, 'bytes': 300, 'max_bytes': 1000},
+    ]
+    combined = combine_cache_stats(stats)
+
+    assert combined['hits'] == 3
+    assert combined['misses'] == 4
+    assert combined['evictions'] == 2
+    assert combined['hit_rate'] == 0.5
+    assert combined['bytes'] == 300
+
+
+def test_concurrent_sessions_complete():
+    pytest.importorskip('streamlit')
+    sessions, iterations = 4, 2
+    results, stats = run_load(sessions, iterations, timeout=60)
+
+    # Every session visits every page on every iteration, none of them crash the harness
+    pages = [r[0] for r in results]
+    assert pages.count('overview') == sessions * iterations
+    assert pages.count('listings') == sessions * iterations
+    assert stats['misses'] >= sessions
@@ -0,0 +1,215 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from datetime import date
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from app_data.utils import read_api
+from app_data.utils.result_cache import ResultCache
+
+
+def make_listings():
+    current = pd.DataFrame({
+        'mls_id': [1, 2, 3],
+        'price': [500_000.0, 900_000.0, 1_200_000.0],
+        'bedrooms': [3, 4, 4],
+        'municipality': ['Vaughan', 'Toronto', 'Vaughan'],
+    })
+    removed = current.assign(removal_date=['2026-01-05', '2026-03-01', '2026-06-01'])
+    return {
+        'matched_current': current,
+        'deduped_current': current,
+        'matched_removed': removed,
+        'deduped_removed': removed,
+    }
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Serve a synthetic snapshot, returning a GET helper"""
+    state = {
+        'version': 'v1',
+        'read': lambda: ({'total': 3}, make_listings()),
+        'interactions_version': 'i1',
+        'interactions': lambda: {},
+    }
+    monkeypatch.setattr(read_api, 'snapshot_version', lambda: state['version'])
+    monkeypatch.setattr(read_api, 'read_snapshot', lambda: state['read']())
+    monkeypatch.setattr(read_api, 'interactions_version', lambda: state['interactions_version'])
+    monkeypatch.setattr(read_api, 'load_user_interactions', lambda: state['interactions']())
+    cache = ResultCache(max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(read_api, 'get_result_cache', lambda: cache)
+    monkeypatch.setattr(read_api, 'SNAPSHOT_RETRY_SECONDS', 0)
+
+    monkeypatch.setattr(read_api.ReadAPIHandler, 'log_message', lambda *args: None)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), read_api.ReadAPIHandler)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True).start()
+
+    def get(path, headers=None):
+        request = urllib.request.Request(f"http://127.0.0.1:{server.server_port}{path}", headers=headers or {})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.headers, response.read().decode()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read().decode()
+
+    get.state = state
+    get.cache = cache
+    yield get
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_filters():
+    params = {
+        'price_min': ['100'],
+        'bedrooms': ['3,4'],
+        'municipality': ['Vaughan, Toronto'],
+        'sold_to': ['2026-02-01'],
+    }
+    price_range, bedrooms, municipalities, date_range = read_api.parse_filters(params)
+    assert price_range == (100.0, float('inf'))
+    assert bedrooms == (3.0, 4.0)
+    assert municipalities == ('Vaughan', 'Toronto')
+    assert date_range == (date.min, date(2026, 2, 1))
+    assert read_api.parse_filters({}) == (None, None, None, None)
+
+
+@pytest.mark.parametrize('params', [
+    {'price_min': ['cheap']},
+    {'bedrooms': ['three']},
+    {'sold_from': ['01/02/2026']},
+])
+def test_parse_filters_rejects_bad_values(params):
+    with pytest.raises(read_api.QueryError):
+        read_api.parse_filters(params)
+
+
+def test_etag_matches_weak_and_wildcard():
+    assert read_api.etag_matches('"abc"', '"abc"')
+    assert read_api.etag_matches('W/"abc"', '"abc"')
+    assert read_api.etag_matches('"other", W/"abc"', '"abc"')
+    assert read_api.etag_matches('*', '"abc"')
+    assert not read_api.etag_matches('', '"abc"')
+    assert not read_api.etag_matches('"abcd"', '"abc"')
+
+
+def test_listings_filter_page_and_project(api):
+    status, headers, body = api('/listings/matched_current?municipality=Vaughan&fields=mls_id,price&limit=1&offset=1')
+    assert status == 200
+    assert headers['X-Total-Count'] == '2'
+    assert headers['X-Snapshot-Version'] == 'v1'
+    assert json.loads(body)['rows'] == [{'mls_id': 3, 'price': 1_200_000.0}]
+
+
+def test_listings_csv(api):
+    status, headers, body = api('/listings/matched_removed?format=csv&sold_from=2026-02-01&fields=mls_id')
+    assert status == 200
+    assert headers['Content-Type'] == 'text/csv'
+    assert body.splitlines() == ['mls_id', '2', '3']
+
+
+def test_if_none_match_returns_304(api):
+    _, headers, _ = api('/listings/matched_current')
+    etag = headers['ETag']
+    for if_none_match in (etag, f'W/{etag}', '*'):
+        status, _, body = api('/listings/matched_current', {'If-None-Match': if_none_match})
+        assert status == 304
+        assert body == ''
+
+
+def test_etag_changes_with_snapshot(api):
+    _, headers, _ = api('/listings/matched_current')
+    api.state['version'] = 'v2'
+    status, new_headers, _ = api('/listings/matched_current', {'If-None-Match': headers['ETag']})
+    assert status == 200
+    assert new_headers['ETag'] != headers['ETag']
+
+
+@pytest.mark.parametrize('path', [
+    '/listings/matched_current?sold_from=2026-01-01',
+    '/listings/matched_current?price_min=abc',
+    '/listings/matched_current?fields=nope',
+    '/listings/matched_current?limit=0',
+    '/listings/matched_current?format=xml',
+    '/leads?reached_out=maybe',
+])
+def test_bad_requests_return_400(api, path):
+    status, _, body = api(path)
+    assert status == 400
+    assert 'error' in json.loads(body)
+
+
+def test_unknown_category_returns_404(api):
+    assert api('/listings/nope')[0] == 404
+
+
+def test_leads_combine_removed_categories(api):
+    status, _, body = api('/leads?match=probable&reached_out=false&fields=mls_id,match')
+    assert status == 200
+    assert json.loads(body)['rows'] == [{'mls_id': i, 'match': 'probable'} for i in (1, 2, 3)]
+
+
+def test_snapshot_read_during_refresh_is_not_cached(api, monkeypatch):
+    # Every version check sees different files, as if a refresh were writing them
+    versions = iter(range(100))
+    monkeypatch.setattr(read_api, 'snapshot_version', lambda: str(next(versions)))
+
+    status, headers, body = api('/snapshot')
+    assert status == 503
+    assert headers['Retry-After']
+    assert api.cache.stats()['entries'] == 0
+
+
+def test_unreadable_snapshot_returns_503(api):
+    def missing():
+        raise FileNotFoundError('matched_current_listings.csv')
+    api.state['read'] = missing
+    assert api('/snapshot')[0] == 503
+
+
+def test_leads_use_interactions_read_under_their_version(api):
+    api.state['interactions'] = lambda: {'2': {'reached_out': True, 'date_reached': '2026-07-01'}}
+    status, headers, body = api('/leads?match=matched&reached_out=true&fields=mls_id')
+    assert status == 200
+    assert json.loads(body)['rows'] == [{'mls_id': 2}]
+
+    # A save bumps the version, the new content gets a new ETag instead of the old one
+    api.state['interactions_version'] = 'i2'
+    api.state['interactions'] = lambda: {}
+    status, new_headers, body = api('/leads?match=matched&reached_out=true&fields=mls_id')
+    assert json.loads(body)['rows'] == []
+    assert new_headers['ETag'] != headers['ETag']
+
+
+def test_interactions_saved_during_read_are_not_cached(api, monkeypatch):
+    versions = iter(range(100))
+    monkeypatch.setattr(read_api, 'interactions_version', lambda: str(next(versions)))
+
+    status, headers, _ = api('/leads')
+    assert status == 503
+    assert headers['Retry-After']
+    assert not any(key[0] in ('api_interactions', 'api_leads') for key in api.cache._entries)
+
+
+def test_half_written_interactions_are_retried(api):
+    reads = iter([
+        lambda: json.loads('{"2": {"reached_'),
+        lambda: {'2': {'reached_out': True}},
+    ])
+    api.state['interactions'] = lambda: next(reads)()
+
+    status, _, body = api('/leads?match=matched&reached_out=true&fields=mls_id')
+    assert status == 200
+    assert json.loads(body)['rows'] == [{'mls_id': 2}]
+
+
+def test_unexpected_error_returns_500(api, monkeypatch):
+    monkeypatch.setattr(read_api, 'build_leads', lambda *args: 1 / 0)
+    status, _, body = api('/leads')
+    assert status == 500
+    assert json.loads(body) == {'error': 'Internal server error'}
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from app_data.utils.result_cache import ResultCache, estimate_size, snapshot_version
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = ResultCache(max_bytes=estimate_size('x' * 100) * 2)
+    cache.put('a', 'x' * 100)
+    cache.put('b', 'y' * 100)
+    assert cache.get('a') is not None
+    cache.put('c', 'z' * 100)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_budget_is_respected():
+    value = 'x' * 1000
+    cache = ResultCache(max_bytes=estimate_size(value) * 3)
+    for i in range(10):
+        cache.put(i, value)
+
+    stats = cache.stats()
+    assert stats['entries'] == 3
+    assert stats['bytes'] <= stats['max_bytes']
+
+
+def test_value_larger_than_budget_is_returned_but_not_stored():
+    cache = ResultCache(max_bytes=10)
+    assert cache.put('big', 'x' * 100) == 'x' * 100
+    assert cache.get('big') is None
+    assert cache.stats()['bytes'] == 0
+
+
+def test_dataframe_size_counts_contents():
+    small = pd.DataFrame({'s': ['a'] * 10})
+    large = pd.DataFrame({'s': ['a' * 1000] * 10})
+    assert estimate_size(large) > estimate_size(small) > 0
+
+
+def test_get_or_compute_hits_after_first_call():
+    cache = ResultCache(max_bytes=10_000)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute('k', lambda: calls.append(1) or 'value') == 'value'
+
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (2, 1)
+
+
+def test_concurrent_misses_compute_once():
+    cache = ResultCache(max_bytes=10_000)
+    calls = []
+    barrier = threading.Barrier(8)
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return 'value'
+
+    def worker():
+        barrier.wait()
+        results.append(cache.get_or_compute('k', compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == ['value'] * 8
+    stats = cache.stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] + stats['coalesced'] == 7
+    assert stats['hit_rate'] == pytest.approx(7 / 8)
+
+
+def test_failed_compute_is_not_cached():
+    cache = ResultCache(max_bytes=10_000)
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute('k', fail)
+    assert cache.get_or_compute('k', lambda: 'value') == 'value'
+
+
+def test_snapshot_version_changes_with_files(tmp_path):
+    (tmp_path / 'listings_summary.json').write_text('{}')
+    before = snapshot_version(str(tmp_path))
+    assert snapshot_version(str(tmp_path)) == before
+
+    (tmp_path / 'matched_current_listings.csv').write_text('mls_id\n1\n')
+    assert snapshot_version(str(tmp_path)) != before